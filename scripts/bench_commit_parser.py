@@ -0,0 +1,83 @@
+"""Compara el parser de commits a nivel de bytes con los parsers anteriores.
+
+Uso: python scripts/bench_commit_parser.py [num_commits]
+"""
+import sys
+import timeit
+from typing import Any, Dict, List
+
+from guardian.commit_parser import parse_commit_bytes, parse_commits
+
+
+def legacy_dag_parse(data: bytes) -> Dict[str, Any]:
+    """Copia de ``dag_builder.parse_commit`` antes del parser unificado."""
+    content = data.decode(errors="replace")
+    parents: List[str] = []
+    metadata: Dict[str, str] = {}
+    parts = content.split("\n\n", 1)
+    header = parts[0]
+    if len(parts) > 1 and parts[1].strip():
+        metadata["message"] = parts[1].strip()
+    for line in header.split("\n"):
+        if line.startswith("parent "):
+            parts = line.split()
+            if len(parts) >= 2:
+                parents.append(parts[1])
+        elif " " in line:
+            key, value = line.split(" ", 1)
+            metadata[key] = value
+    return {"parents": parents, "metadata": metadata}
+
+
+def legacy_scanner_parse(raw_data: bytes) -> Dict[str, Any]:
+    """Copia de ``object_scanner.parse_commit_data`` antes del parser unificado."""
+    lines = raw_data.decode().splitlines()
+    parents = []
+    metadata = {}
+    for line in lines:
+        if line.startswith("parent "):
+            parents.append(line.split()[1])
+        elif " " in line:
+            key, value = line.split(" ", 1)
+            metadata[key] = value
+    return {"parents": parents, "metadata": metadata}
+
+
+def make_payloads(count: int) -> List[bytes]:
+    message = b"Refactor del escaneo de packfiles\n\n" + b"Detalle del cambio. " * 40
+    return [
+        b"tree %040x\nparent %040x\n"
+        b"author Dev <dev@example.com> %d +0000\n"
+        b"committer Dev <dev@example.com> %d +0000\n\n" % (i, i + 1, i, i)
+        + message
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payloads = make_payloads(count)
+    candidates = {
+        "dag_builder.parse_commit (anterior)": lambda: [
+            legacy_dag_parse(p) for p in payloads
+        ],
+        "object_scanner.parse_commit_data (anterior)": lambda: [
+            legacy_scanner_parse(p) for p in payloads
+        ],
+        "parse_commit_bytes": lambda: [parse_commit_bytes(p) for p in payloads],
+        "parse_commits (lote)": lambda: parse_commits(payloads),
+        "parse_commits + timestamps": lambda: [
+            (c.author.timestamp, c.committer.timestamp)
+            for c in parse_commits(payloads)
+        ],
+        "parse_commits + metadata() (build_dag)": lambda: [
+            c.metadata() for c in parse_commits(payloads)
+        ],
+    }
+    for name, func in candidates.items():
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:45s} {best * 1000:8.1f} ms  {count / best:12,.0f} commits/s")
+
+
+if __name__ == "__main__":
+    main()
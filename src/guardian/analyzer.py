@@ -0,0 +1,146 @@
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+from .commit_parser import Commit
+
+# Tolerancia para relojes desajustados antes de marcar un timestamp.
+CLOCK_SKEW = 24 * 3600
+
+
+class CommitInfo(NamedTuple):
+    """Lo único que el análisis guarda de cada commit."""
+
+    parents: Tuple[str, ...]
+    timestamp: Optional[int]
+    author_timestamp: Optional[int]
+    author: str
+
+    @classmethod
+    def from_commit(cls, commit: Commit) -> "CommitInfo":
+        author = commit.author
+        committer = commit.committer or author
+        return cls(
+            tuple(commit.parents),
+            committer.timestamp if committer is not None else None,
+            author.timestamp if author is not None else None,
+            # Los autores se repiten mucho: una sola copia de cada uno.
+            sys.intern(author.ident) if author is not None else "",
+        )
+
+
+@dataclass
+class HistoryStats:
+    commits: int = 0
+    merges: int = 0
+    roots: int = 0
+    missing_parents: int = 0
+    edges: int = 0
+    max_depth: int = 0
+    longest_path: List[str] = field(default_factory=list)
+    branching_factor: float = 0.0
+    authors: Counter = field(default_factory=Counter)
+    anomalies: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def analyze_history(
+    commits: Mapping[str, CommitInfo], now: Optional[float] = None
+) -> HistoryStats:
+    """Calcula estadísticas del historial en una sola pasada topológica.
+
+    Cada commit se visita una vez, después de todos sus padres, guardando
+    solo su profundidad, su timestamp y el padre por el que pasa el camino
+    más largo.
+    """
+    limit = (time.time() if now is None else now) + CLOCK_SKEW
+    stats = HistoryStats()
+    authors = stats.authors
+    anomalies = stats.anomalies
+    depth: Dict[str, int] = {}
+    stamps: Dict[str, int] = {}
+    best_parent: Dict[str, str] = {}
+    expanded: Set[str] = set()
+    with_children: Set[str] = set()
+    merges = roots = missing = edges = max_depth = 0
+    tip = ""
+
+    for start in commits:
+        if start in depth:
+            continue
+        stack = [start]
+        while stack:
+            sha = stack[-1]
+            if sha in depth:
+                stack.pop()
+                continue
+            commit = commits[sha]
+            parents = commit.parents
+            if sha not in expanded:
+                # Primero los padres; un padre ya expandido indicaría un ciclo.
+                expanded.add(sha)
+                pending = [
+                    p for p in parents
+                    if p not in depth and p not in expanded and p in commits
+                ]
+                if pending:
+                    stack.extend(pending)
+                    continue
+            stack.pop()
+
+            if not parents:
+                roots += 1
+            elif len(parents) > 1:
+                merges += 1
+
+            timestamp = commit.timestamp
+            longest = 0
+            for parent_sha in parents:
+                if parent_sha not in commits:
+                    missing += 1
+                    continue
+                edges += 1
+                with_children.add(parent_sha)
+                parent_depth = depth.get(parent_sha, 0)
+                if parent_depth > longest:
+                    longest = parent_depth
+                    best_parent[sha] = parent_sha
+                parent_timestamp = stamps.get(parent_sha)
+                if (timestamp is not None and parent_timestamp is not None
+                        and timestamp + CLOCK_SKEW < parent_timestamp):
+                    anomalies.append((sha, f"older than parent {parent_sha}"))
+
+            longest += 1
+            depth[sha] = longest
+            if longest > max_depth:
+                max_depth = longest
+                tip = sha
+
+            if commit.author:
+                authors[commit.author] += 1
+            if timestamp is not None:
+                author_timestamp = commit.author_timestamp
+                if (author_timestamp is not None
+                        and author_timestamp > timestamp + CLOCK_SKEW):
+                    anomalies.append((sha, "authored after committed"))
+                stamps[sha] = timestamp
+                if timestamp > limit:
+                    anomalies.append((sha, "timestamp in the future"))
+
+    path = []
+    sha = tip
+    while sha:
+        path.append(sha)
+        sha = best_parent.get(sha, "")
+
+    stats.commits = len(depth)
+    stats.merges = merges
+    stats.roots = roots
+    stats.missing_parents = missing
+    stats.edges = edges
+    stats.max_depth = max_depth
+    stats.longest_path = path[::-1]
+    if with_children:
+        stats.branching_factor = edges / len(with_children)
+    return stats
@@ -1,12 +1,34 @@
+import gc
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import AbstractSet, List, Optional
 
 import click
 import networkx as nx
+from networkx import DiGraph
 
-from guardian.dag_builder import build_dag
-from guardian.object_scanner import GitObject, read_loose, read_packfile
+from guardian.analyzer import CommitInfo, analyze_history
+from guardian.commit_parser import parse_commit_bytes
+from guardian.dag_builder import (
+    append_graphml,
+    build_dag,
+    load_dag_state,
+    save_dag_state,
+)
+from guardian.github_client import DEFAULT_API, GitHubClient, annotate_dag
+from guardian.object_scanner import (
+    GitObject,
+    iter_commits,
+    read_loose,
+    read_packfile,
+)
+from guardian.pack_verify import verify_packs
+from guardian.space_usage import space_usage
+from guardian.utils import format_size
+from guardian.watcher import SOCKET_NAME, query, watch
+
+MTIME_SLACK_NS = 2_000_000_000
 
 
 @click.group()
@@ -39,10 +61,16 @@ def scan(repo_path: Path):
 @click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
 @click.option("--output", "-o",
               default="recovered.graphml", help="Ruta de salida para el grafo")
-def export_graph(repo_path: Path, output: str):
+@click.option("--incremental", is_flag=True,
+              help="Añade solo los commits nuevos a un GraphML ya exportado")
+def export_graph(repo_path: Path, output: str, incremental: bool):
     """Exporta el DAG del repositorio a formato GraphML."""
     try:
         git_dir = _get_git_dir(repo_path)
+        if incremental:
+            added = _export_incremental(git_dir, Path(output))
+            click.echo(f"✓ DAG exported to {output} ({added} commits nuevos)")
+            return
         commits = _get_commits_from_repo(git_dir)
         dag = build_dag(commits)
         nx.write_graphml(dag, output)
@@ -51,6 +79,209 @@ def export_graph(repo_path: Path, output: str):
         click.echo(f"✗ Error: {str(e)}", err=True)
         sys.exit(1)
 
+@cli.command()
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--top", default=10, show_default=True,
+              help="Número de autores y anomalías a mostrar")
+def analyze(repo_path: Path, top: int):
+    """Analiza la estructura del historial de commits."""
+    # Millones de objetos sin referencias cíclicas: el recolector de ciclos
+    # solo añadiría pausas al crecer el número de objetos vivos.
+    gc.disable()
+    try:
+        git_dir = _get_git_dir(repo_path)
+        # Cada payload se descarta tras extraer su CommitInfo.
+        commits = {
+            sha: CommitInfo.from_commit(parse_commit_bytes(payload))
+            for sha, payload in iter_commits(git_dir)
+        }
+        stats = analyze_history(commits)
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+    finally:
+        gc.enable()
+
+    click.echo(f"Commits: {stats.commits}")
+    click.echo(f"Merges: {stats.merges}")
+    click.echo(f"Raíces: {stats.roots}")
+    click.echo(f"Padres ausentes: {stats.missing_parents}")
+    click.echo(f"Profundidad máxima: {stats.max_depth}")
+    if stats.longest_path:
+        click.echo(
+            f"Camino más largo: {stats.longest_path[0]} → {stats.longest_path[-1]}"
+        )
+    click.echo(f"Factor de ramificación: {stats.branching_factor:.2f}")
+    click.echo("Autores:")
+    for author, count in stats.authors.most_common(top):
+        click.echo(f"  {count:>6}  {author}")
+    click.echo(f"Anomalías de timestamp: {len(stats.anomalies)}")
+    for sha, reason in stats.anomalies[:top]:
+        click.echo(f"  {sha}: {reason}")
+
+@cli.command()
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--top", default=10, show_default=True,
+              help="Número de objetos más grandes a mostrar")
+def du(repo_path: Path, top: int):
+    """Muestra el uso de espacio por tipo y los objetos más grandes."""
+    try:
+        git_dir = _get_git_dir(repo_path)
+        report = space_usage(git_dir, top=top)
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    click.echo(f"{'tipo':<8}{'objetos':>10}{'comprimido':>14}{'sin comprimir':>16}")
+    for obj_type in sorted(report.count):
+        click.echo(
+            f"{obj_type:<8}{report.count[obj_type]:>10}"
+            f"{format_size(report.compressed[obj_type]):>14}"
+            f"{format_size(report.uncompressed[obj_type]):>16}"
+        )
+    click.echo(
+        f"{'total':<8}{sum(report.count.values()):>10}"
+        f"{format_size(sum(report.compressed.values())):>14}"
+        f"{format_size(sum(report.uncompressed.values())):>16}"
+    )
+    click.echo(f"Ratio de compresión: {report.ratio:.2f}x")
+
+    click.echo(f"\nTop {top} objetos:")
+    for size, compressed, obj_type, location in report.top_objects():
+        click.echo(
+            f"{format_size(size):>12}{format_size(compressed):>12}  "
+            f"{obj_type:<7}{location}"
+        )
+
+    for location, message in report.errors:
+        click.echo(f"✗ Error en {location}: {message}", err=True)
+
+@cli.command()
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--remote", "-r", required=True, help="Repositorio remoto owner/nombre")
+@click.option("--token", envvar="GITHUB_TOKEN", default=None,
+              help="Token de la API (por defecto $GITHUB_TOKEN)")
+@click.option("--api-url", default=DEFAULT_API, show_default=True)
+@click.option("--workers", default=8, show_default=True,
+              help="Peticiones concurrentes")
+@click.option("--output", "-o",
+              default="github.graphml", help="Ruta de salida para el grafo")
+def github(repo_path: Path, remote: str, token: Optional[str], api_url: str,
+           workers: int, output: str):
+    """Une los metadatos remotos de GitHub al DAG y lo exporta."""
+    try:
+        git_dir = _get_git_dir(repo_path)
+        dag = build_dag(_get_commits_from_repo(git_dir))
+        cache_dir = git_dir / "guardian" / "github-cache"
+        with GitHubClient(remote, token, api_url, cache_dir, workers) as client:
+            annotated = annotate_dag(dag, client)
+        nx.write_graphml(dag, output)
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    click.echo(
+        f"✓ {annotated}/{dag.number_of_nodes()} commits con metadatos remotos "
+        f"({client.requests} peticiones, {client.cache_hits} desde caché)"
+    )
+    click.echo(f"✓ DAG exported to {output}")
+
+@cli.command("verify-packs")
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--full", is_flag=True,
+              help="Infla cada objeto y comprueba su SHA-1 (más lento)")
+@click.option("--jobs", "-j", default=4, show_default=True,
+              help="Packfiles verificados en paralelo")
+def verify_packs_cmd(repo_path: Path, full: bool, jobs: int):
+    """Verifica la integridad de los packfiles y muestra su throughput."""
+    try:
+        git_dir = _get_git_dir(repo_path)
+        started = time.perf_counter()
+        results = verify_packs(git_dir, full=full, jobs=jobs)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    error_count = 0
+    for result in results:
+        stats = (
+            f"{result.objects} objetos, {format_size(result.size)} en "
+            f"{result.seconds:.3f} s ({format_size(result.throughput)}/s)"
+        )
+        if result.ok:
+            click.echo(f"✓ {result.path.name}: {stats}")
+        else:
+            click.echo(f"✗ Error en {result.path}: {result.error}", err=True)
+            error_count += 1
+
+    total_size = sum(r.size for r in results)
+    mode = "completa" if full else "rápida"
+    click.echo(
+        f"Verificación {mode}: {len(results)} packfiles, "
+        f"{format_size(total_size)} en {elapsed:.3f} s "
+        f"({format_size(total_size / elapsed if elapsed else 0)}/s)"
+    )
+    if error_count:
+        click.echo(f"\nSe encontraron {error_count} errores", err=True)
+        sys.exit(2)
+
+@cli.command("watch")
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path),
+              default=None, help="Socket Unix (por defecto .git/guardian.sock)")
+@click.option("--interval", default=1.0, show_default=True,
+              help="Segundos entre revisiones de .git/objects")
+def watch_cmd(repo_path: Path, socket_path: Optional[Path], interval: float):
+    """Verifica objetos nuevos en segundo plano y atiende consultas."""
+    try:
+        git_dir = _get_git_dir(repo_path)
+        socket_path = socket_path or git_dir / SOCKET_NAME
+        click.echo(f"Vigilando {git_dir / 'objects'} en {socket_path}", err=True)
+        watch(git_dir, socket_path, interval)
+    except KeyboardInterrupt:
+        sys.exit(0)
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+
+@cli.command("query")
+@click.argument("repo_path", type=click.Path(exists=True, path_type=Path))
+@click.argument("command", type=click.Choice(["scan", "export"]))
+@click.option("--output", "-o",
+              default="recovered.graphml", help="Ruta de salida para el grafo")
+@click.option("--socket", "socket_path", type=click.Path(path_type=Path),
+              default=None, help="Socket Unix (por defecto .git/guardian.sock)")
+def query_cmd(repo_path: Path, command: str, output: str,
+              socket_path: Optional[Path]):
+    """Consulta a un proceso `guardian watch` en ejecución."""
+    try:
+        git_dir = _get_git_dir(repo_path)
+        socket_path = socket_path or git_dir / SOCKET_NAME
+        if command == "export":
+            command = f"export {Path(output).resolve()}"
+        response = query(socket_path, command)
+    except Exception as e:
+        click.echo(f"✗ Error: {str(e)}", err=True)
+        sys.exit(1)
+
+    if not response.get("ok"):
+        click.echo(f"✗ Error: {response.get('error')}", err=True)
+        sys.exit(1)
+
+    if "output" in response:
+        click.echo(f"✓ DAG exported to {output}")
+        sys.exit(0)
+
+    errors = response["errors"]
+    for path, message in errors.items():
+        click.echo(f"✗ Error en {path}: {message}", err=True)
+    if errors:
+        click.echo(f"\nSe encontraron {len(errors)} errores", err=True)
+        sys.exit(2)
+    click.echo("No se encontraron errores en los objetos Git")
+    sys.exit(0)
+
 def _get_git_dir(repo_path: Path) -> Path:
     """Obtiene la ruta del directorio .git válido."""
     git_dir = repo_path / ".git" if (repo_path / ".git").exists() else repo_path
@@ -91,13 +322,23 @@ def _scan_repository(git_dir: Path) -> int:
 
     return error_count
 
-def _get_commits_from_repo(git_dir: Path) -> List[GitObject]:
-    """Obtiene todos los objetos commit de un repositorio Git."""
+def _get_commits_from_repo(
+    git_dir: Path,
+    since_ns: int = 0,
+    skip_packs: AbstractSet[str] = frozenset(),
+) -> List[GitObject]:
+    """Obtiene todos los objetos commit de un repositorio Git.
+
+    ``since_ns`` omite los objetos sueltos no modificados desde esa marca de
+    tiempo y ``skip_packs`` los packfiles (por nombre) ya procesados.
+    """
     commits = []
     objects_dir = git_dir / "objects"
 
     # Escanear objetos sueltos
     for obj_file in objects_dir.glob("??/*"):
+        if since_ns and obj_file.stat().st_mtime_ns <= since_ns:
+            continue
         try:
             obj = read_loose(obj_file)
             if obj.type == "commit":
@@ -109,6 +350,8 @@ def _get_commits_from_repo(git_dir: Path) -> List[GitObject]:
     pack_dir = objects_dir / "pack"
     if pack_dir.exists():
         for pack_file in pack_dir.glob("*.pack"):
+            if pack_file.name in skip_packs:
+                continue
             try:
                 objects = read_packfile(pack_file)
                 commits.extend(o for o in objects if o.type == "commit")
@@ -117,6 +360,42 @@ def _get_commits_from_repo(git_dir: Path) -> List[GitObject]:
 
     return commits
 
+def _export_incremental(git_dir: Path, output: Path) -> int:
+    """Actualiza ``output`` con los commits nuevos y devuelve cuántos son."""
+    # Margen para sistemas de archivos con marcas de tiempo de baja
+    # resolución; los commits ya conocidos se descartan en build_dag.
+    started_ns = time.time_ns() - MTIME_SLACK_NS
+    state = load_dag_state(output)
+    known_shas = set(state["commits"])
+    known = DiGraph()
+    known.add_nodes_from(known_shas)
+
+    pack_dir = git_dir / "objects" / "pack"
+    packs = sorted(p.name for p in pack_dir.glob("*.pack")) if pack_dir.exists() else []
+    commits = _get_commits_from_repo(
+        git_dir,
+        since_ns=state.get("since_ns", 0),
+        skip_packs=set(state.get("packs", [])),
+    )
+    waiting = state.get("waiting", {})
+    dag = build_dag(commits, base=known, waiting=waiting)
+    new_nodes = [sha for sha in dag if sha not in known_shas]
+
+    if new_nodes and not (state["commits"] and append_graphml(dag, output, new_nodes)):
+        full = nx.read_graphml(output) if state["commits"] else DiGraph()
+        full.add_nodes_from((sha, dag.nodes[sha]) for sha in new_nodes)
+        full.add_edges_from(dag.edges)
+        nx.write_graphml(full, output)
+    elif not state["commits"]:
+        nx.write_graphml(dag, output)
+
+    state["commits"] = list(state["commits"]) + new_nodes
+    state["waiting"] = waiting
+    state["packs"] = packs
+    state["since_ns"] = started_ns
+    save_dag_state(output, state)
+    return len(new_nodes)
+
 def main():
     cli()
 
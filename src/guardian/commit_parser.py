@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+class Signature(NamedTuple):
+    """Autor o committer de un commit: ``Nombre <email> timestamp zona``."""
+
+    ident: str
+    timestamp: int
+    offset: str
+
+
+def parse_signature(value: bytes) -> Signature:
+    """Parsea una línea ``author``/``committer`` (sin la clave)."""
+    head, _, offset = value.rpartition(b" ")
+    ident, _, timestamp = head.rpartition(b" ")
+    if timestamp.isdigit() and ident.endswith(b">"):
+        return Signature(ident.decode(errors="replace"), int(timestamp),
+                         offset.decode(errors="replace"))
+
+    # Firma incompleta: se conserva lo que haya hasta el email.
+    end = value.rfind(b">") + 1 or len(value)
+    rest = value[end:].split()
+    return Signature(
+        value[:end].decode(errors="replace"),
+        int(rest[0]) if rest and rest[0].isdigit() else 0,
+        rest[1].decode(errors="replace") if len(rest) > 1 else "",
+    )
+
+
+@dataclass(slots=True)
+class Commit:
+    """Cabecera de un commit Git.
+
+    El mensaje y las firmas se guardan como bytes y se decodifican solo
+    cuando se piden; cada firma se parsea como mucho una vez.
+    """
+
+    tree: str
+    parents: List[str]
+    extra: Dict[str, str]
+    raw: bytes = field(repr=False)
+    body_offset: int = field(repr=False)
+    author_raw: bytes = field(default=b"", repr=False)
+    committer_raw: bytes = field(default=b"", repr=False)
+    _author: Optional[Signature] = field(default=None, init=False, repr=False)
+    _committer: Optional[Signature] = field(default=None, init=False, repr=False)
+
+    @property
+    def author(self) -> Optional[Signature]:
+        if self._author is None and self.author_raw:
+            self._author = parse_signature(self.author_raw)
+        return self._author
+
+    @property
+    def committer(self) -> Optional[Signature]:
+        if self._committer is None and self.committer_raw:
+            self._committer = parse_signature(self.committer_raw)
+        return self._committer
+
+    @property
+    def message_bytes(self) -> bytes:
+        return self.raw[self.body_offset:]
+
+    @property
+    def message(self) -> str:
+        return self.raw[self.body_offset:].decode(errors="replace")
+
+    def metadata(self) -> Dict[str, str]:
+        """Metadatos como texto, en el formato de los nodos del DAG."""
+        metadata: Dict[str, str] = {}
+        if self.tree:
+            metadata["tree"] = self.tree
+        if self.author_raw:
+            metadata["author"] = self.author_raw.decode(errors="replace")
+        if self.committer_raw:
+            metadata["committer"] = self.committer_raw.decode(errors="replace")
+        metadata.update(self.extra)
+        message = self.message.strip()
+        if message:
+            metadata["message"] = message
+        return metadata
+
+
+def parse_commit_bytes(raw: bytes) -> Commit:
+    """Parsea el payload de un commit sin decodificar el mensaje.
+
+    Solo se recorre la cabecera (hasta la primera línea vacía, localizada con
+    ``bytes.find``); el mensaje queda como un desplazamiento sobre ``raw``.
+    Nunca falla por bytes que no sean UTF-8.
+    """
+    header_end = raw.find(b"\n\n")
+    if header_end < 0:
+        header_end = body_offset = len(raw)
+    else:
+        body_offset = header_end + 2
+
+    tree = ""
+    parents: List[str] = []
+    extra: Dict[str, str] = {}
+    author = committer = b""
+    last_key = ""
+
+    for line in raw[:header_end].split(b"\n"):
+        key, _, value = line.partition(b" ")
+        if key == b"parent":
+            if value:
+                parents.append(value.decode(errors="replace"))
+        elif key == b"tree":
+            tree = value.decode(errors="replace")
+        elif key == b"author":
+            author = value
+        elif key == b"committer":
+            committer = value
+        elif key:
+            last_key = key.decode(errors="replace")
+            extra[last_key] = value.decode(errors="replace")
+            continue
+        elif line and last_key:
+            # Continuación de una cabecera multilínea (gpgsig, mergetag...)
+            extra[last_key] += "\n" + value.decode(errors="replace")
+            continue
+        last_key = ""
+
+    return Commit(tree, parents, extra, raw, body_offset, author, committer)
+
+
+def parse_commits(payloads: Iterable[bytes]) -> List[Commit]:
+    """Parsea muchos payloads de commit en una sola llamada."""
+    parse = parse_commit_bytes
+    return [parse(raw) for raw in payloads]
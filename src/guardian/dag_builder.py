@@ -1,7 +1,13 @@
-from typing import Any, Dict, List
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
 
 from networkx import DiGraph
 
+from .commit_parser import parse_commit_bytes
 from .object_scanner import GitObject
 
 
@@ -10,50 +16,122 @@ def parse_commit(commit: GitObject) -> Dict[str, Any]:
     if commit.type != "commit":
         raise ValueError(f"Expected commit object, got {commit.type}")
 
-    try:
-        content = commit.data.decode(errors='replace')
-    except UnicodeDecodeError as e:
-        raise ValueError(f"Invalid commit encoding: {str(e)}") from e
-
-    parents: List[str] = []
-    metadata: Dict[str, str] = {}
-
-    # Separar header y message
-    parts = content.split('\n\n', 1)
-    header = parts[0]
-    if len(parts) > 1 and parts[1].strip():
-        metadata["message"] = parts[1].strip()
-
-    # Procesar líneas del header
-    for line in header.split('\n'):
-        if line.startswith('parent '):
-            parts = line.split()
-            if len(parts) >= 2:
-                parents.append(parts[1])
-        elif ' ' in line:
-            key, value = line.split(' ', 1)
-            metadata[key] = value
-
-    return {"parents": parents, "metadata": metadata}
-
-def build_dag(commits: List[GitObject]) -> DiGraph:
-    """Construye un DAG a partir de objetos Git commit válidos."""
-    dag = DiGraph()
-    commit_map: Dict[str, Dict[str, Any]] = {}
+    parsed = parse_commit_bytes(commit.data)
+    return {"parents": parsed.parents, "metadata": parsed.metadata()}
+
+def build_dag(
+    commits: List[GitObject],
+    base: Optional[DiGraph] = None,
+    waiting: Optional[Dict[str, List[str]]] = None,
+) -> DiGraph:
+    """Construye un DAG a partir de objetos Git commit válidos.
+
+    Si se pasa ``base`` (un grafo persistido previamente), se modifica en el
+    sitio añadiendo solo los commits cuyo SHA aún no está en el grafo.
+    ``waiting`` guarda, para cada padre que aún no está en el grafo, los
+    hijos que esperan su arista; se actualiza en el sitio para que un padre
+    que llegue en una llamada posterior reciba sus aristas.
+    """
+    dag = base if base is not None else DiGraph()
+    waiting = waiting if waiting is not None else {}
+    new_parents: Dict[str, List[str]] = {}
 
     for commit in commits:
-        if commit.type != "commit":
+        if commit.type != "commit" or commit.sha in dag:
             continue
 
         try:
             data = parse_commit(commit)
-            commit_map[commit.sha] = data
-            dag.add_node(commit.sha, **data["metadata"])
-
-            for parent_sha in data["parents"]:
-                if parent_sha in commit_map:
-                    dag.add_edge(parent_sha, commit.sha)
         except ValueError:
             continue
+        dag.add_node(commit.sha, **data["metadata"])
+        new_parents[commit.sha] = data["parents"]
+
+    # Las aristas se añaden al final para no depender del orden de entrada.
+    for sha, parents in new_parents.items():
+        for parent_sha in parents:
+            if parent_sha in dag:
+                dag.add_edge(parent_sha, sha)
+            else:
+                waiting.setdefault(parent_sha, []).append(sha)
+
+    # Hijos indexados antes que su padre (p. ej. durante un fetch).
+    for sha in new_parents:
+        for child_sha in waiting.pop(sha, []):
+            dag.add_edge(sha, child_sha)
 
     return dag
+
+def _state_path(output: Path) -> Path:
+    return output.with_name(output.name + ".state.json")
+
+def load_dag_state(output: Path) -> Dict[str, Any]:
+    """Lee el estado persistido junto a un GraphML exportado.
+
+    El estado incluye al menos la lista ``commits`` de SHAs ya exportados;
+    si el GraphML o su estado no existen se devuelve un estado vacío.
+    """
+    state_path = _state_path(output)
+    if not output.exists() or not state_path.exists():
+        return {"commits": []}
+    with open(state_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_dag_state(output: Path, state: Dict[str, Any]) -> None:
+    """Guarda el estado del GraphML exportado en ``output``."""
+    tmp_path = _state_path(output).with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    tmp_path.replace(_state_path(output))
+
+def _graphml_keys(output: Path) -> Dict[str, str]:
+    """Devuelve el mapa ``attr.name -> id`` de las claves de nodo declaradas."""
+    keys: Dict[str, str] = {}
+    for _, elem in ElementTree.iterparse(output, events=("start",)):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if tag == "key" and elem.get("for") in ("node", "all"):
+            keys[elem.get("attr.name", "")] = elem.get("id", "")
+        elif tag in ("node", "edge"):
+            break
+    return keys
+
+def append_graphml(dag: DiGraph, output: Path, new_nodes: Iterable[str]) -> bool:
+    """Añade al final de un GraphML existente los nodos nuevos y sus aristas.
+
+    Solo reescribe la cola del archivo. Devuelve False, sin modificarlo, si
+    algún atributo no está declarado en la cabecera y hace falta una
+    exportación completa.
+    """
+    keys = _graphml_keys(output)
+    new_nodes = list(new_nodes)
+    lines: List[str] = []
+    edges: Set[Tuple[str, str]] = set()
+
+    for sha in new_nodes:
+        attrs = dag.nodes[sha]
+        if any(name not in keys for name in attrs):
+            return False
+        lines.append(f"    <node id={quoteattr(sha)}>")
+        for name, value in attrs.items():
+            lines.append(f'      <data key="{keys[name]}">{escape(str(value))}</data>')
+        lines.append("    </node>")
+        edges.update(dag.in_edges(sha))
+        edges.update(dag.out_edges(sha))
+
+    for source, target in sorted(edges):
+        lines.append(
+            f"    <edge source={quoteattr(source)} target={quoteattr(target)} />"
+        )
+
+    with open(output, "r+b") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 256))
+        tail = f.read()
+        end = tail.rfind(b"</graph>")
+        if end < 0:
+            return False
+        f.seek(size - len(tail) + end)
+        f.truncate()
+        f.write(("\n".join(lines) + "\n  </graph>\n</graphml>\n").encode())
+
+    return True
@@ -0,0 +1,283 @@
+import hashlib
+import http.client
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from networkx import DiGraph
+
+DEFAULT_API = "https://api.github.com"
+PER_PAGE = 100
+MAX_RETRIES = 3
+
+
+class GitHubClient:
+    """Cliente HTTP para la API REST de GitHub.
+
+    Reutiliza conexiones keep-alive de un pool acotado, hace peticiones
+    concurrentes, guarda las respuestas con su ETag en disco para enviar
+    peticiones condicionales y espera al reinicio del límite de peticiones
+    cuando se agota.
+    """
+
+    def __init__(
+        self,
+        repo: str,
+        token: Optional[str] = None,
+        base_url: str = DEFAULT_API,
+        cache_dir: Optional[Path] = None,
+        workers: int = 8,
+        timeout: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.time,
+    ):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Invalid API URL: {base_url}")
+        self.repo = repo
+        self.workers = workers
+        self.cache_dir = cache_dir
+        self.requests = 0
+        self.cache_hits = 0
+
+        self._scheme = url.scheme
+        self._host = url.hostname
+        self._port = url.port
+        self._prefix = url.path.rstrip("/")
+        self._timeout = timeout
+        self._headers = {
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "repo-guardian",
+        }
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
+
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._remaining: Optional[int] = None
+        self._reset = 0.0
+        # Límite secundario (Retry-After): independiente de la ventana horaria.
+        self._retry_until = 0.0
+        self._sleep = sleep
+        self._clock = clock
+
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "GitHubClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _connection(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            if self._scheme == "https":
+                return http.client.HTTPSConnection(
+                    self._host, self._port, timeout=self._timeout
+                )
+            return http.client.HTTPConnection(
+                self._host, self._port, timeout=self._timeout
+            )
+
+    def _cache_path(self, path: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / (hashlib.sha1(path.encode()).hexdigest() + ".json")
+
+    def _load_cache(self, path: str) -> Optional[Dict[str, Any]]:
+        cache_path = self._cache_path(path)
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store_cache(self, path: str, etag: str, body: Any) -> None:
+        cache_path = self._cache_path(path)
+        if cache_path is None:
+            return
+        tmp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"etag": etag, "body": body}, f)
+        tmp_path.replace(cache_path)
+
+    def _wait_for_rate_limit(self) -> None:
+        # Mientras haya un bloqueo activo (Retry-After o límite agotado hasta
+        # X-RateLimit-Reset), todos los hilos esperan; nadie lo levanta antes
+        # de tiempo.
+        while True:
+            with self._lock:
+                now = self._clock()
+                delay = self._retry_until - now
+                if self._remaining == 0:
+                    if self._reset > now:
+                        delay = max(delay, self._reset - now)
+                    else:
+                        # Tras el reinicio el servidor volverá a informar
+                        # del límite.
+                        self._remaining = None
+                if delay <= 0:
+                    if self._remaining is not None:
+                        self._remaining -= 1
+                    return
+            self._sleep(delay)
+
+    def _retry_after(self, seconds: float) -> None:
+        with self._lock:
+            self._retry_until = max(self._retry_until, self._clock() + seconds)
+
+    def _update_rate_limit(self, response: http.client.HTTPResponse) -> None:
+        remaining = response.getheader("X-RateLimit-Remaining")
+        reset = response.getheader("X-RateLimit-Reset")
+        with self._lock:
+            if reset is not None and reset.isdigit() and float(reset) > self._reset:
+                # Nueva ventana: el contador del servidor sustituye al local.
+                # No afecta a un bloqueo por Retry-After.
+                self._reset = float(reset)
+                self._remaining = None
+            if remaining is not None and remaining.isdigit():
+                # Las respuestas de peticiones en vuelo pueden llegar
+                # desordenadas: dentro de una ventana solo se baja el contador.
+                if self._remaining is None or int(remaining) < self._remaining:
+                    self._remaining = int(remaining)
+
+    def _request(
+        self, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, http.client.HTTPResponse, bytes]:
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("GET", self._prefix + path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                # Conexión keep-alive cerrada por el servidor: se reintenta
+                # una vez con una conexión nueva.
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            if response.will_close:
+                conn.close()
+            else:
+                self._pool.put(conn)
+            return response.status, response, body
+        raise AssertionError("unreachable")
+
+    def get(self, path: str) -> Any:
+        """GET sobre la API; devuelve el JSON decodificado o None si no existe."""
+        cached = self._load_cache(path)
+        headers = dict(self._headers)
+        if cached is not None:
+            headers["If-None-Match"] = cached["etag"]
+
+        for _ in range(MAX_RETRIES):
+            self._wait_for_rate_limit()
+            status, response, body = self._request(path, headers)
+            with self._lock:
+                self.requests += 1
+            self._update_rate_limit(response)
+
+            if status == 304 and cached is not None:
+                with self._lock:
+                    self.cache_hits += 1
+                return cached["body"]
+            if status in (404, 422):
+                # GitHub responde 422 al pedir un commit que no conoce.
+                return None
+            if status in (403, 429):
+                retry_after = response.getheader("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    self._retry_after(float(retry_after))
+                    continue
+                if response.getheader("X-RateLimit-Remaining") == "0":
+                    # _wait_for_rate_limit espera hasta X-RateLimit-Reset.
+                    continue
+            if status >= 400:
+                raise ValueError(f"GitHub API error {status} for {path}")
+
+            data = json.loads(body) if body else None
+            etag = response.getheader("ETag")
+            if etag:
+                self._store_cache(path, etag, data)
+            return data
+
+        raise ValueError(f"GitHub API rate limit exceeded for {path}")
+
+    def get_many(self, paths: Iterable[str]) -> Dict[str, Any]:
+        """Hace varias peticiones GET concurrentes."""
+        paths = list(dict.fromkeys(paths))
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return dict(zip(paths, executor.map(self.get, paths), strict=True))
+
+    def commit_path(self, sha: str) -> str:
+        return f"/repos/{self.repo}/commits/{sha}"
+
+    def history_path(self, ref: str, page: int) -> str:
+        query = urlencode({"sha": ref, "per_page": PER_PAGE, "page": page})
+        return f"/repos/{self.repo}/commits?{query}"
+
+
+def _remote_attributes(item: Dict[str, Any]) -> Dict[str, Any]:
+    verification = (item.get("commit") or {}).get("verification") or {}
+    return {
+        "remote_url": item.get("html_url") or "",
+        "remote_author": (item.get("author") or {}).get("login") or "",
+        "verified": bool(verification.get("verified", False)),
+    }
+
+
+def annotate_dag(dag: DiGraph, client: GitHubClient) -> int:
+    """Añade a los nodos del DAG los metadatos remotos de cada commit.
+
+    Los commits se piden por páginas de 100 desde cada punta del DAG, en
+    rondas concurrentes; solo los que no aparecen en ninguna página se piden
+    uno a uno. Devuelve el número de nodos anotados.
+    """
+    remote: Dict[str, Dict[str, Any]] = {}
+    pages = {sha: 1 for sha in dag if dag.out_degree(sha) == 0}
+
+    while pages:
+        paths = {ref: client.history_path(ref, page) for ref, page in pages.items()}
+        results = client.get_many(paths.values())
+        next_pages = {}
+        for ref, path in paths.items():
+            items = results[path] or []
+            new = [item for item in items if item.get("sha") not in remote]
+            for item in new:
+                remote[item["sha"]] = _remote_attributes(item)
+            if len(items) == PER_PAGE and new:
+                next_pages[ref] = pages[ref] + 1
+        pages = next_pages
+
+    missing = [sha for sha in dag if sha not in remote]
+    if missing:
+        results = client.get_many(client.commit_path(sha) for sha in missing)
+        for sha in missing:
+            item = results[client.commit_path(sha)]
+            if item:
+                remote[sha] = _remote_attributes(item)
+
+    annotated = 0
+    for sha in dag:
+        if sha in remote:
+            dag.nodes[sha].update(remote[sha])
+            annotated += 1
+    return annotated
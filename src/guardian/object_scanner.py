@@ -1,13 +1,20 @@
 import binascii
 import hashlib
+import mmap
 import struct
 import zlib
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from .commit_parser import parse_commit_bytes
 
 PACK_SIGNATURE = b'PACK'
 PACK_VERSION = 2
+PACK_TRAILER_SIZE = 20
+PACK_TYPES: Dict[int, str] = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+Buffer = Union[bytes, mmap.mmap]
 
 
 @dataclass
@@ -65,17 +72,13 @@ def read_packfile(pack_path: Path) -> List[GitObject]:
     with open(pack_path, 'rb') as f:
         data = f.read()
 
-    if len(data) < 12:
-        raise ValueError("Packfile too small to be valid")
+    objects, _ = _parse_packfile(data)
+    return objects
 
-    signature = data[:4]
-    version = struct.unpack('>I', data[4:8])[0]
-    num_objects = struct.unpack('>I', data[8:12])[0]
 
-    if signature != PACK_SIGNATURE:
-        raise ValueError("Invalid packfile signature")
-    if version != PACK_VERSION:
-        raise ValueError(f"Unsupported packfile version: {version}")
+def _parse_packfile(data: bytes) -> Tuple[List[GitObject], bool]:
+    """Lee todas las entradas; indica también si el pack tiene trailer."""
+    num_objects = _read_pack_header(data)
 
     objects = []
     offset = 12
@@ -89,11 +92,53 @@ def read_packfile(pack_path: Path) -> List[GitObject]:
                 raise ValueError(f"Invalid CRC at offset {offset-4}") from e
             raise ValueError(f"Error reading packfile: {str(e)}") from e
 
-    return objects
+    has_trailer = _check_pack_trailer(data, offset)
+    return objects, has_trailer
 
 
-def _read_pack_entry(data: bytes, offset: int) -> Tuple[GitObject, int]:
-    """Lee una entrada individual en un packfile."""
+def _check_pack_trailer(
+    data: Buffer, end: int, digest: Optional[bytes] = None
+) -> bool:
+    """Comprueba el checksum SHA-1 que sigue a la última entrada.
+
+    ``digest`` permite pasar el SHA-1 de ``data[:end]`` ya calculado.
+    Devuelve False si el packfile no tiene trailer.
+    """
+    remaining = len(data) - end
+    if remaining == 0:
+        return False
+    if remaining != PACK_TRAILER_SIZE:
+        raise ValueError(f"Unexpected {remaining} bytes after last object")
+
+    if digest is None:
+        digest = hashlib.sha1(data[:end]).digest()
+    stored = data[end:]
+    if digest != stored:
+        raise ValueError(
+            f"Pack checksum mismatch: stored {stored.hex()} != computed {digest.hex()}"
+        )
+    return True
+
+
+def _read_pack_header(data: Buffer) -> int:
+    """Valida la cabecera de un packfile y devuelve el número de objetos."""
+    if len(data) < 12:
+        raise ValueError("Packfile too small to be valid")
+
+    signature = data[:4]
+    version = struct.unpack('>I', data[4:8])[0]
+    num_objects = struct.unpack('>I', data[8:12])[0]
+
+    if signature != PACK_SIGNATURE:
+        raise ValueError("Invalid packfile signature")
+    if version != PACK_VERSION:
+        raise ValueError(f"Unsupported packfile version: {version}")
+
+    return num_objects
+
+
+def _read_pack_entry_header(data: Buffer, offset: int) -> Tuple[str, int, int]:
+    """Lee la cabecera de una entrada: tipo, tamaño comprimido y offset de datos."""
     if offset >= len(data):
         raise ValueError("Unexpected end of packfile")
 
@@ -112,9 +157,11 @@ def _read_pack_entry(data: bytes, offset: int) -> Tuple[GitObject, int]:
         size |= (byte & 0x7f) << shift
         shift += 7
 
-    type_map: Dict[int, str] = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
-    obj_type_str = type_map.get(obj_type, "unknown")
+    return PACK_TYPES.get(obj_type, "unknown"), size, offset
 
+
+def _pack_entry_data(data: Buffer, offset: int, size: int) -> bytes:
+    """Devuelve los datos comprimidos de una entrada tras comprobar su CRC."""
     if offset + size + 4 > len(data):
         raise ValueError(
             f"Truncated object data (missing data or CRC) - "
@@ -132,32 +179,85 @@ def _read_pack_entry(data: bytes, offset: int) -> Tuple[GitObject, int]:
             f"CRC mismatch at offset {crc_offset}: "
             f"stored {stored_crc:08x} != computed {computed_crc:08x}"
         )
+    return compressed_data
+
 
+def _inflate_pack_entry(obj_type_str: str, compressed_data: bytes) -> GitObject:
+    """Infla una entrada y calcula su SHA-1; único decodificador de entradas."""
     try:
         raw_data = zlib.decompress(compressed_data)
     except zlib.error as e:
         raise ValueError(f"Invalid zlib data: {str(e)}") from e
 
     header = f"{obj_type_str} {len(raw_data)}\0".encode()
-    obj = GitObject(
+    return GitObject(
         type=obj_type_str,
         data=raw_data,
         sha=hashlib.sha1(header + raw_data).hexdigest()
     )
 
-    return obj, crc_offset + 4
+
+def _read_pack_entry(data: bytes, offset: int) -> Tuple[GitObject, int]:
+    """Lee una entrada individual en un packfile."""
+    obj_type_str, size, offset = _read_pack_entry_header(data, offset)
+    compressed_data = _pack_entry_data(data, offset, size)
+    return _inflate_pack_entry(obj_type_str, compressed_data), offset + size + 4
+
+
+def iter_commits(git_dir: Path) -> Iterator[Tuple[str, bytes]]:
+    """Recorre los commits de un repositorio sin cargar el resto de objetos.
+
+    Devuelve pares ``(sha, payload)`` uno a uno. De los objetos sueltos solo
+    se infla la cabecera para descartar los que no son commits, y de los
+    packfiles (leídos por ``mmap``) solo se inflan las entradas de tipo
+    commit. Los objetos o packfiles corruptos se omiten.
+    """
+    objects_dir = git_dir / "objects"
+
+    for obj_file in objects_dir.glob("??/*"):
+        try:
+            with open(obj_file, "rb") as f:
+                probe = zlib.decompressobj().decompress(f.read(64), 32)
+            if not probe.startswith(b"commit "):
+                continue
+            obj = read_loose(obj_file)
+        except (OSError, ValueError, zlib.error):
+            continue
+        yield obj.sha, obj.data
+
+    pack_dir = objects_dir / "pack"
+    if not pack_dir.exists():
+        return
+    for pack_file in pack_dir.glob("*.pack"):
+        try:
+            yield from _iter_pack_commits(pack_file)
+        except (OSError, ValueError, zlib.error):
+            continue
+
+
+def _iter_pack_commits(pack_path: Path) -> Iterator[Tuple[str, bytes]]:
+    if pack_path.stat().st_size < 12:
+        raise ValueError("Packfile too small to be valid")
+    with open(pack_path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        num_objects = _read_pack_header(data)
+        offset = 12
+        for _ in range(num_objects):
+            obj_type, size, offset = _read_pack_entry_header(data, offset)
+            end = offset + size
+            if end + 4 > len(data):
+                raise ValueError("Truncated object data")
+            if obj_type == "commit":
+                # Mismo decodificador que read_packfile: mismos SHA y payload
+                # que en export-graph, watch y github.
+                obj = _inflate_pack_entry(
+                    obj_type, _pack_entry_data(data, offset, size)
+                )
+                yield obj.sha, obj.data
+            offset = end + 4
+
 
 def parse_commit_data(raw_data: bytes) -> dict:
-    """Extrae sha, padres y metadatos de un objeto commit."""
-    lines = raw_data.decode().splitlines()
-    parents = []
-    metadata = {}
-
-    for line in lines:
-        if line.startswith("parent "):
-            parents.append(line.split()[1])
-        elif " " in line:
-            key, value = line.split(" ", 1)
-            metadata[key] = value
-
-    return {"parents": parents, "metadata": metadata}
+    """Extrae padres y metadatos de un objeto commit."""
+    parsed = parse_commit_bytes(raw_data)
+    return {"parents": parsed.parents, "metadata": parsed.metadata()}
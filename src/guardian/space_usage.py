@@ -0,0 +1,116 @@
+import heapq
+import mmap
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Tuple
+
+from .object_scanner import Buffer, _read_pack_entry_header, _read_pack_header
+
+# Bytes comprimidos que se inflan para leer la cabecera "<tipo> <tamaño>\0".
+HEADER_PROBE = 64
+INFLATE_CHUNK = 1 << 16
+
+
+@dataclass
+class SpaceReport:
+    top: int = 10
+    count: Counter = field(default_factory=Counter)
+    compressed: Counter = field(default_factory=Counter)
+    uncompressed: Counter = field(default_factory=Counter)
+    # Montículo mínimo de (tamaño, comprimido, tipo, ubicación)
+    largest: List[Tuple[int, int, str, str]] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+    def add(self, obj_type: str, size: int, compressed: int, location: str) -> None:
+        self.count[obj_type] += 1
+        self.compressed[obj_type] += compressed
+        self.uncompressed[obj_type] += size
+        item = (size, compressed, obj_type, location)
+        if len(self.largest) < self.top:
+            heapq.heappush(self.largest, item)
+        elif item > self.largest[0]:
+            heapq.heapreplace(self.largest, item)
+
+    def top_objects(self) -> List[Tuple[int, int, str, str]]:
+        return sorted(self.largest, reverse=True)
+
+    @property
+    def ratio(self) -> float:
+        total = sum(self.compressed.values())
+        return sum(self.uncompressed.values()) / total if total else 0.0
+
+
+def _inflated_size(data: Buffer, start: int, end: int) -> int:
+    """Tamaño declarado en la cabecera inflando solo los primeros bytes.
+
+    Si el contenido no empieza por una cabecera "<tipo> <tamaño>\\0", se
+    infla la entrada completa en bloques, sin conservar la salida.
+    """
+    inflater = zlib.decompressobj()
+    probe = inflater.decompress(data[start:min(end, start + HEADER_PROBE)], 32)
+    header, sep, _ = probe.partition(b"\0")
+    if sep:
+        parts = header.split(b" ")
+        if len(parts) == 2 and parts[1].isdigit():
+            return int(parts[1])
+
+    inflater = zlib.decompressobj()
+    size = 0
+    for pos in range(start, end, INFLATE_CHUNK):
+        size += len(inflater.decompress(data[pos:min(end, pos + INFLATE_CHUNK)]))
+    return size + len(inflater.flush())
+
+
+def _scan_loose(path: Path, report: SpaceReport) -> None:
+    with open(path, "rb") as f:
+        probe = f.read(HEADER_PROBE)
+        compressed = f.seek(0, 2)
+    header = zlib.decompressobj().decompress(probe, 32)
+    obj_header, sep, _ = header.partition(b"\0")
+    parts = obj_header.split(b" ")
+    if not sep or len(parts) != 2 or not parts[1].isdigit():
+        raise ValueError("Invalid object format: missing header")
+    obj_type = parts[0].decode(errors="replace")
+    report.add(obj_type, int(parts[1]), compressed, path.parent.name + path.name)
+
+
+def _scan_pack(path: Path, report: SpaceReport) -> None:
+    if path.stat().st_size < 12:
+        raise ValueError("Packfile too small to be valid")
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        num_objects = _read_pack_header(data)
+        offset = 12
+        for _ in range(num_objects):
+            entry_offset = offset
+            obj_type, compressed, offset = _read_pack_entry_header(data, offset)
+            end = offset + compressed
+            if end + 4 > len(data):
+                raise ValueError(f"Truncated object data at offset {entry_offset}")
+            size = _inflated_size(data, offset, end)
+            report.add(obj_type, size, compressed, f"{path.name}@{entry_offset}")
+            offset = end + 4
+
+
+def space_usage(git_dir: Path, top: int = 10) -> SpaceReport:
+    """Calcula el uso de espacio por objeto leyendo solo sus cabeceras."""
+    report = SpaceReport(top=top)
+    objects_dir = git_dir / "objects"
+
+    for obj_file in objects_dir.glob("??/*"):
+        try:
+            _scan_loose(obj_file, report)
+        except (OSError, ValueError, zlib.error) as e:
+            report.errors.append((str(obj_file), str(e)))
+
+    pack_dir = objects_dir / "pack"
+    if pack_dir.exists():
+        for pack_file in pack_dir.glob("*.pack"):
+            try:
+                _scan_pack(pack_file, report)
+            except (OSError, ValueError, zlib.error) as e:
+                report.errors.append((str(pack_file), str(e)))
+
+    return report
@@ -0,0 +1,7 @@
+def format_size(size: float) -> str:
+    """Formatea un tamaño en bytes con unidades binarias (KiB, MiB...)."""
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if abs(size) < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
@@ -0,0 +1,185 @@
+import json
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import networkx as nx
+from networkx import DiGraph
+
+from .dag_builder import build_dag
+from .object_scanner import GitObject, read_loose, read_packfile
+
+SOCKET_NAME = "guardian.sock"
+
+
+class ObjectIndex:
+    """Índice en memoria de los objetos y el DAG de un repositorio Git.
+
+    Cada archivo se verifica una sola vez; ``refresh`` solo procesa los
+    objetos sueltos y packfiles nuevos o modificados desde la última llamada.
+    """
+
+    def __init__(self, git_dir: Path):
+        self.objects_dir = git_dir / "objects"
+        self.seen: Dict[Path, Tuple[int, int]] = {}
+        self.errors: Dict[Path, str] = {}
+        self.commits: Dict[str, GitObject] = {}
+        self._dag = DiGraph()
+        self._pending: List[GitObject] = []
+        self._waiting: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def _candidates(self) -> Iterator[Path]:
+        yield from self.objects_dir.glob("??/*")
+        pack_dir = self.objects_dir / "pack"
+        if pack_dir.exists():
+            yield from pack_dir.glob("*.pack")
+
+    def _verify(self, path: Path) -> List[GitObject]:
+        if path.suffix == ".pack":
+            return read_packfile(path)
+        return [read_loose(path)]
+
+    def refresh(self) -> List[Path]:
+        """Verifica los objetos nuevos y devuelve las rutas procesadas."""
+        with self._lock:
+            current: Dict[Path, Tuple[int, int]] = {}
+            for path in self._candidates():
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                current[path] = (st.st_mtime_ns, st.st_size)
+
+            # Objetos eliminados (p. ej. tras `git gc`): los commits siguen
+            # siendo válidos porque pasan a un packfile.
+            for path in set(self.seen) - set(current):
+                del self.seen[path]
+                self.errors.pop(path, None)
+
+            changed = [p for p, stamp in current.items() if self.seen.get(p) != stamp]
+            for path in changed:
+                self.seen[path] = current[path]
+                try:
+                    objects = self._verify(path)
+                except FileNotFoundError:
+                    # Borrado entre stat() y la lectura (p. ej. por `git gc`).
+                    del self.seen[path]
+                    self.errors.pop(path, None)
+                    continue
+                except (OSError, ValueError) as e:
+                    self.errors[path] = str(e)
+                    continue
+                self.errors.pop(path, None)
+                for obj in objects:
+                    if obj.type == "commit" and obj.sha not in self.commits:
+                        self.commits[obj.sha] = obj
+                        self._pending.append(obj)
+
+            return changed
+
+    def _sync_dag(self) -> DiGraph:
+        # Solo los commits recién descubiertos se añaden al DAG en memoria.
+        if self._pending:
+            build_dag(self._pending, base=self._dag, waiting=self._waiting)
+            self._pending = []
+        return self._dag
+
+    @property
+    def dag(self) -> DiGraph:
+        with self._lock:
+            return self._sync_dag()
+
+    def scan(self) -> Dict[str, Any]:
+        """Resultado del escaneo con el estado actual del índice."""
+        self.refresh()
+        with self._lock:
+            return {
+                "ok": True,
+                "objects": len(self.seen),
+                "errors": {str(p): msg for p, msg in sorted(self.errors.items())},
+            }
+
+    def export(self, output: str) -> Dict[str, Any]:
+        """Exporta el DAG en memoria a formato GraphML."""
+        self.refresh()
+        with self._lock:
+            dag = self._sync_dag()
+            nx.write_graphml(dag, output)
+            return {"ok": True, "output": output, "commits": dag.number_of_nodes()}
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    server: "WatchServer"
+
+    def handle(self) -> None:
+        line = self.rfile.readline().decode(errors="replace").strip()
+        command, _, arg = line.partition(" ")
+        index = self.server.index
+        try:
+            if command == "scan":
+                response = index.scan()
+            elif command == "export" and arg:
+                response = index.export(arg)
+            else:
+                response = {"ok": False, "error": f"Unknown query: {line!r}"}
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class WatchServer(socketserver.ThreadingUnixStreamServer):
+    """Servidor en un socket Unix que responde consultas sobre un índice."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, index: ObjectIndex):
+        self.index = index
+        if socket_path.exists():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(str(socket_path))
+                except OSError:
+                    # Socket huérfano de un proceso que terminó sin borrarlo.
+                    socket_path.unlink(missing_ok=True)
+                else:
+                    raise ValueError(
+                        f"Another guardian watch is already listening on {socket_path}"
+                    )
+        super().__init__(str(socket_path), _QueryHandler)
+
+
+def watch(
+    git_dir: Path,
+    socket_path: Optional[Path] = None,
+    interval: float = 1.0,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    """Mantiene el índice actualizado y atiende consultas hasta ``stop``."""
+    socket_path = socket_path or git_dir / SOCKET_NAME
+    stop = stop or threading.Event()
+    index = ObjectIndex(git_dir)
+    index.refresh()
+
+    server = WatchServer(socket_path, index)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        while not stop.wait(interval):
+            index.refresh()
+    finally:
+        server.shutdown()
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+
+
+def query(socket_path: Path, command: str, timeout: float = 30.0) -> Dict[str, Any]:
+    """Envía una consulta al proceso ``guardian watch`` y devuelve su respuesta."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(command.encode() + b"\n")
+        with sock.makefile("rb") as f:
+            return json.loads(f.readline())
@@ -0,0 +1,44 @@
+import binascii
+import hashlib
+import struct
+import zlib
+
+import pytest
+
+PACK_TYPE_NAMES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+
+
+def _write_loose(objects_dir, obj_type: str, content: bytes) -> str:
+    """Escribe un objeto suelto válido y devuelve su SHA."""
+    full_content = f"{obj_type} {len(content)}\0".encode() + content
+    sha = hashlib.sha1(full_content).hexdigest()
+    obj_dir = objects_dir / sha[:2]
+    obj_dir.mkdir(parents=True, exist_ok=True)
+    (obj_dir / sha[2:]).write_bytes(zlib.compress(full_content))
+    return sha
+
+
+def _pack_entry(obj_type: int, content: bytes, header: bool = True) -> bytes:
+    """Entrada de packfile en el formato que lee read_packfile."""
+    name = PACK_TYPE_NAMES[obj_type]
+    payload = f"{name} {len(content)}\0".encode() + content if header else content
+    compressed = zlib.compress(payload)
+    size = len(compressed)
+    obj_header = bytearray([(obj_type << 4) | (size & 0b1111)])
+    size >>= 4
+    while size:
+        obj_header[-1] |= 0x80
+        obj_header.append(size & 0x7f)
+        size >>= 7
+    crc = binascii.crc32(compressed)
+    return bytes(obj_header) + compressed + struct.pack(">I", crc)
+
+
+@pytest.fixture
+def write_loose():
+    return _write_loose
+
+
+@pytest.fixture
+def pack_entry():
+    return _pack_entry
@@ -0,0 +1,55 @@
+from guardian.analyzer import CommitInfo, analyze_history
+from guardian.commit_parser import parse_commit_bytes
+
+
+def make_commit(parents, author="Ana <ana@x>", timestamp=1700000000):
+    header = "".join(f"parent {p}\n" for p in parents)
+    raw = (
+        f"tree abc\n{header}"
+        f"author {author} {timestamp} +0000\n"
+        f"committer {author} {timestamp} +0000\n\nmsg"
+    )
+    return CommitInfo.from_commit(parse_commit_bytes(raw.encode()))
+
+
+def test_analyze_history_structure():
+    """Prueba conteos, profundidad y camino más largo en un historial con merge."""
+    commits = {
+        "d": make_commit(["b", "c"], timestamp=1700000300),
+        "c": make_commit(["a"], author="Bob <bob@x>", timestamp=1700000200),
+        "b": make_commit(["a"], timestamp=1700000100),
+        "a": make_commit([]),
+        "e": make_commit(["d", "zz"], timestamp=1700000400),
+    }
+    stats = analyze_history(commits, now=1700000500)
+
+    assert stats.commits == 5
+    assert stats.merges == 2
+    assert stats.roots == 1
+    assert stats.missing_parents == 1
+    assert stats.max_depth == 4
+    assert stats.longest_path[0] == "a" and stats.longest_path[-2:] == ["d", "e"]
+    assert stats.branching_factor == 5 / 4
+    assert stats.authors == {"Ana <ana@x>": 4, "Bob <bob@x>": 1}
+    assert stats.anomalies == []
+
+
+def test_analyze_history_timestamp_anomalies():
+    """Prueba la detección de commits anteriores a su padre y en el futuro."""
+    commits = {
+        "a": make_commit([], timestamp=1700000000),
+        "b": make_commit(["a"], timestamp=1600000000),
+        "c": make_commit(["b"], timestamp=1900000000),
+    }
+    stats = analyze_history(commits, now=1700000000)
+    assert stats.anomalies == [
+        ("b", "older than parent a"),
+        ("c", "timestamp in the future"),
+    ]
+
+
+def test_analyze_history_cycle_terminates():
+    """Prueba que datos corruptos con ciclos no bloquean el recorrido."""
+    commits = {"a": make_commit(["b"]), "b": make_commit(["a"])}
+    stats = analyze_history(commits, now=1700000000)
+    assert stats.commits == 2
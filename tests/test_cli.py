@@ -1,13 +1,17 @@
+import hashlib
+import struct
 import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 import click
+import networkx as nx
 import pytest
 from click.testing import CliRunner
 from guardian.cli import _get_commits_from_repo, _get_git_dir, _scan_repository, cli
-from guardian.object_scanner import GitObject
+from guardian.dag_builder import build_dag
+from guardian.object_scanner import GitObject, read_packfile
 
 
 @pytest.fixture
@@ -143,3 +147,92 @@ def test_main_execution(mocker):
         from guardian.cli import main
         main()
         mock_cli.assert_called_once()
+
+
+def test_cli_export_graph_incremental(runner, tmp_path, write_loose):
+    objects_dir = tmp_path / ".git" / "objects"
+    objects_dir.mkdir(parents=True)
+    first = write_loose(objects_dir, "commit", b"tree abc\n\nfirst")
+    output = tmp_path / "dag.graphml"
+    args = ["export-graph", str(tmp_path), "-o", str(output), "--incremental"]
+
+    result = runner.invoke(cli, args)
+    assert result.exit_code == 0
+    assert "(1 commits nuevos)" in result.output
+
+    second = write_loose(objects_dir, "commit", f"parent {first}\n\nsecond".encode())
+    result = runner.invoke(cli, args)
+    assert "(1 commits nuevos)" in result.output
+
+    result = runner.invoke(cli, args)
+    assert "(0 commits nuevos)" in result.output
+
+    dag = nx.read_graphml(output)
+    assert set(dag.nodes) == {first, second}
+    assert (first, second) in dag.edges
+
+
+def test_cli_analyze(runner, tmp_path, write_loose):
+    objects_dir = tmp_path / ".git" / "objects"
+    objects_dir.mkdir(parents=True)
+    root = write_loose(
+        objects_dir, "commit", b"tree abc\nauthor Ana <a@x> 1 +0000\n\nroot"
+    )
+    write_loose(objects_dir, "commit", f"parent {root}\n\nchild".encode())
+
+    result = runner.invoke(cli, ["analyze", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Commits: 2" in result.output
+    assert "Profundidad máxima: 2" in result.output
+    assert "Ana <a@x>" in result.output
+
+
+def test_cli_analyze_packed(runner, tmp_path, pack_entry):
+    pack_dir = tmp_path / ".git" / "objects" / "pack"
+    pack_dir.mkdir(parents=True)
+    pack = pack_dir / "a.pack"
+
+    def write_pack(*entries):
+        pack.write_bytes(
+            struct.pack(">4sII", b"PACK", 2, len(entries)) + b"".join(entries)
+        )
+
+    root = pack_entry(1, b"tree abc\nauthor Ana <a@x> 1 +0000\n\nroot")
+    write_pack(root)
+    root_sha = read_packfile(pack)[0].sha
+    write_pack(
+        root,
+        pack_entry(3, b"blob data"),
+        pack_entry(1, f"tree abc\nparent {root_sha}\n\nchild".encode()),
+    )
+
+    result = runner.invoke(cli, ["analyze", str(tmp_path)])
+    assert result.exit_code == 0
+    assert "Commits: 2" in result.output
+    assert "Profundidad máxima: 2" in result.output
+
+    # analyze y export-graph deben identificar los commits con el mismo SHA.
+    dag = build_dag(_get_commits_from_repo(tmp_path / ".git"))
+    assert f"Camino más largo: {root_sha} → " in result.output
+    child_sha = result.output.split(f"{root_sha} → ")[1].split()[0]
+    assert list(dag.edges) == [(root_sha, child_sha)]
+
+
+def test_cli_export_graph_incremental_child_first(runner, tmp_path, write_loose):
+    objects_dir = tmp_path / ".git" / "objects"
+    objects_dir.mkdir(parents=True)
+    parent_data = b"tree abc\n\nfirst"
+    parent = hashlib.sha1(
+        f"commit {len(parent_data)}\0".encode() + parent_data
+    ).hexdigest()
+    child = write_loose(objects_dir, "commit", f"parent {parent}\n\nsecond".encode())
+    output = tmp_path / "dag.graphml"
+    args = ["export-graph", str(tmp_path), "-o", str(output), "--incremental"]
+
+    runner.invoke(cli, args)
+    write_loose(objects_dir, "commit", parent_data)
+    result = runner.invoke(cli, args)
+    assert "(1 commits nuevos)" in result.output
+
+    dag = nx.read_graphml(output)
+    assert list(dag.edges) == [(parent, child)]
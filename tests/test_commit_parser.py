@@ -0,0 +1,62 @@
+from guardian.commit_parser import Signature, parse_commit_bytes, parse_commits
+from guardian.object_scanner import parse_commit_data
+
+RAW = (
+    b"tree 4b825dc642cb6eb9a060e54bf8d69288fbee4904\n"
+    b"parent 1111111111111111111111111111111111111111\n"
+    b"parent 2222222222222222222222222222222222222222\n"
+    b"author Ana <ana@example.com> 1700000000 +0100\n"
+    b"committer Bob <bob@example.com> 1700000100 -0500\n"
+    b"gpgsig -----BEGIN PGP SIGNATURE-----\n"
+    b" abc\n"
+    b" -----END PGP SIGNATURE-----\n"
+    b"\n"
+    b"Merge branch 'x'\n\nDetalle\n"
+)
+
+
+def test_parse_commit_bytes_header():
+    """Prueba el parseo de cabecera, firmas y cabeceras multilínea."""
+    commit = parse_commit_bytes(RAW)
+    assert commit.tree == "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+    assert commit.parents == ["1" * 40, "2" * 40]
+    assert commit.author == Signature("Ana <ana@example.com>", 1700000000, "+0100")
+    assert commit.committer.timestamp == 1700000100
+    assert commit.committer is commit.committer
+    assert commit.extra["gpgsig"].splitlines()[1] == "abc"
+
+
+def test_parse_commit_bytes_lazy_message():
+    """Prueba que el mensaje es un desplazamiento sobre los bytes originales."""
+    commit = parse_commit_bytes(RAW)
+    assert commit.raw is RAW
+    assert commit.message_bytes == b"Merge branch 'x'\n\nDetalle\n"
+    assert commit.message == "Merge branch 'x'\n\nDetalle\n"
+
+
+def test_parse_commit_bytes_non_utf8():
+    """Prueba que bytes no UTF-8 no provocan errores."""
+    raw = b"tree abc\nauthor Jos\xe9 <j@x> 1 +0000\n\nmensaje \xff"
+    commit = parse_commit_bytes(raw)
+    assert commit.author.ident == "Jos� <j@x>"
+    assert commit.message == "mensaje �"
+    assert parse_commit_data(raw)["metadata"]["tree"] == "abc"
+
+
+def test_parse_commit_bytes_without_message():
+    """Prueba commits sin mensaje, sin firmas y con padres vacíos."""
+    commit = parse_commit_bytes(b"tree abc\nparent \nauthor Test")
+    assert commit.parents == []
+    assert commit.author == Signature("Test", 0, "")
+    assert commit.committer is None
+    assert commit.metadata() == {"tree": "abc", "author": "Test"}
+
+
+def test_parse_commits_batch():
+    """Prueba el modo por lotes."""
+    commits = parse_commits([RAW, b"tree abc\n\nfirst"])
+    assert [c.tree for c in commits] == [
+        "4b825dc642cb6eb9a060e54bf8d69288fbee4904",
+        "abc",
+    ]
+    assert commits[1].metadata()["message"] == "first"
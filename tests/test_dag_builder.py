@@ -1,5 +1,11 @@
+import networkx as nx
 import pytest
-from guardian.dag_builder import build_dag
+from guardian.dag_builder import (
+    append_graphml,
+    build_dag,
+    load_dag_state,
+    save_dag_state,
+)
 from guardian.object_scanner import GitObject
 from networkx import DiGraph
 
@@ -81,3 +87,66 @@ def test_build_dag_invalid_objects():
     dag = build_dag(invalid_objects)
     assert dag.number_of_nodes() == 0
     assert dag.number_of_edges() == 0
+
+def test_build_dag_order_independent(sample_commits):
+    """Prueba que las aristas no dependen del orden de los commits."""
+    dag = build_dag(list(reversed(sample_commits)))
+    assert ("commit_a", "commit_b") in dag.edges
+    assert ("commit_b", "commit_c") in dag.edges
+
+def test_build_dag_incremental(sample_commits):
+    """Prueba que con un grafo base solo se añaden commits nuevos."""
+    base = build_dag(sample_commits[:2])
+    base.nodes["commit_a"]["message"] = "sin tocar"
+
+    dag = build_dag(sample_commits, base=base)
+
+    assert dag is base
+    assert dag.number_of_nodes() == 3
+    assert ("commit_b", "commit_c") in dag.edges
+    assert dag.nodes["commit_a"]["message"] == "sin tocar"
+
+def test_append_graphml(tmp_path, sample_commits):
+    """Prueba que append_graphml añade nodos y aristas al final del archivo."""
+    output = tmp_path / "dag.graphml"
+    dag = build_dag(sample_commits[:2])
+    nx.write_graphml(dag, output)
+
+    build_dag(sample_commits, base=dag)
+    assert append_graphml(dag, output, ["commit_c"])
+
+    loaded = nx.read_graphml(output)
+    assert set(loaded.nodes) == {"commit_a", "commit_b", "commit_c"}
+    assert ("commit_b", "commit_c") in loaded.edges
+    assert loaded.nodes["commit_c"]["message"] == "Commit message 3"
+
+def test_append_graphml_undeclared_key(tmp_path, sample_commits):
+    """Prueba que un atributo sin declarar obliga a la exportación completa."""
+    output = tmp_path / "dag.graphml"
+    dag = build_dag(sample_commits)
+    nx.write_graphml(dag, output)
+    before = output.read_bytes()
+
+    dag.add_node("commit_d", encoding="latin-1")
+    assert not append_graphml(dag, output, ["commit_d"])
+    assert output.read_bytes() == before
+
+def test_dag_state_roundtrip(tmp_path):
+    """Prueba la persistencia del estado asociado a un GraphML."""
+    output = tmp_path / "dag.graphml"
+    assert load_dag_state(output) == {"commits": []}
+
+    output.touch()
+    save_dag_state(output, {"commits": ["commit_a"], "packs": []})
+    assert load_dag_state(output)["commits"] == ["commit_a"]
+
+def test_build_dag_child_before_parent(sample_commits):
+    """Prueba que un hijo indexado antes que su padre recibe la arista."""
+    waiting: dict = {}
+    dag = build_dag([sample_commits[2]], waiting=waiting)
+    assert waiting == {"commit_b": ["commit_c"]}
+
+    build_dag([sample_commits[1]], base=dag, waiting=waiting)
+
+    assert ("commit_b", "commit_c") in dag.edges
+    assert waiting == {"commit_a": ["commit_b"]}
@@ -0,0 +1,250 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from click.testing import CliRunner
+from guardian.cli import cli
+from guardian.github_client import PER_PAGE, GitHubClient, annotate_dag
+from networkx import DiGraph
+
+# Historial remoto lineal: c0 <- c1 <- ... <- c149 <- extra
+HISTORY = [f"c{i}" for i in range(150)] + ["extra"]
+
+
+class FakeGitHub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        with server.lock:
+            server.paths.append(self.path)
+            server.clients.add(self.client_address)
+            remaining = server.remaining
+            server.remaining = max(0, server.remaining - 1)
+
+        if server.limited:
+            server.limited -= 1
+            if server.retry_after:
+                # Límite secundario: el límite horario no está agotado.
+                self.send_json(403, {"message": "secondary rate limit"},
+                               remaining=str(remaining),
+                               retry_after=server.retry_after)
+            else:
+                self.send_json(403, {"message": "rate limited"}, remaining="0")
+            return
+        if parts[:3] != ["api", "repos", "o"] or parts[4] != "commits":
+            self.send_json(404, {})
+            return
+
+        if len(parts) == 6:
+            sha = parts[5]
+            if sha not in HISTORY:
+                # Igual que GitHub: un SHA desconocido no es un 404.
+                self.send_json(422, {"message": f"No commit found for SHA: {sha}"})
+                return
+            body = self.item(sha)
+        else:
+            query = parse_qs(url.query)
+            start = HISTORY.index(query["sha"][0]) if query["sha"][0] in HISTORY else -1
+            page = int(query["page"][0])
+            chain = HISTORY[start::-1] if start >= 0 else []
+            body = [self.item(s) for s in chain[(page - 1) * PER_PAGE:page * PER_PAGE]]
+
+        etag = f'"{hash(json.dumps(body))}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_json(304, None, etag=etag, remaining=str(remaining))
+            return
+        self.send_json(200, body, etag=etag, remaining=str(remaining))
+
+    def item(self, sha):
+        return {
+            "sha": sha,
+            "html_url": f"https://example.com/{sha}",
+            "author": {"login": "ana"},
+            "commit": {"verification": {"verified": sha == "c149"}},
+        }
+
+    def send_json(self, status, body, etag=None, remaining="5000", retry_after=None):
+        payload = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-RateLimit-Remaining", remaining)
+        self.send_header("X-RateLimit-Reset", str(self.server.reset))
+        if etag:
+            self.send_header("ETag", etag)
+        if retry_after:
+            self.send_header("Retry-After", str(retry_after))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGitHub)
+    server.lock = threading.Lock()
+    server.paths = []
+    server.clients = set()
+    server.remaining = 5000
+    server.limited = 0
+    server.reset = 0
+    server.retry_after = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/api"
+
+
+def make_dag():
+    dag = DiGraph()
+    dag.add_nodes_from(HISTORY + ["local"])
+    dag.add_edges_from(zip(HISTORY, HISTORY[1:], strict=False))
+    dag.add_edge("c149", "local")
+    return dag
+
+
+def test_annotate_dag_batches_requests(api, tmp_path):
+    dag = make_dag()
+    with GitHubClient("o/r", base_url=url(api), cache_dir=tmp_path) as client:
+        annotated = annotate_dag(dag, client)
+
+    assert annotated == 151
+    assert dag.nodes["c0"]["remote_url"] == "https://example.com/c0"
+    assert dag.nodes["c149"]["verified"] is True
+    assert dag.nodes["c1"]["remote_author"] == "ana"
+    assert "remote_url" not in dag.nodes["local"]
+    # 2 páginas desde "extra", 1 desde "local" (vacía) y "local" por separado (422)
+    assert len(api.paths) == 4
+    assert len(api.clients) <= client.workers
+
+
+def test_get_uses_etag_cache(api, tmp_path):
+    with GitHubClient("o/r", base_url=url(api), cache_dir=tmp_path) as client:
+        first = client.get(client.commit_path("c1"))
+    with GitHubClient("o/r", base_url=url(api), cache_dir=tmp_path) as client:
+        second = client.get(client.commit_path("c1"))
+        assert client.cache_hits == 1
+    assert first == second
+    assert client.get(client.commit_path("missing")) is None
+
+
+def test_get_unknown_commit_is_none(api):
+    with GitHubClient("o/r", base_url=url(api)) as client:
+        assert client.get(client.commit_path("missing")) is None
+        assert client.get("/repos/o/r/other") is None
+    assert client.requests == 2
+
+
+def test_get_reuses_connections(api):
+    with GitHubClient("o/r", base_url=url(api), workers=1) as client:
+        for sha in HISTORY[:5]:
+            client.get(client.commit_path(sha))
+    assert len(api.clients) == 1
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.slept.append(delay)
+        self.now += delay
+
+
+def test_rate_limit_waits_and_retries(api):
+    clock = FakeClock(1000.0)
+    api.reset = 1060
+    api.limited = 1
+    with GitHubClient("o/r", base_url=url(api), sleep=clock.sleep,
+                      clock=clock) as client:
+        assert client.get(client.commit_path("c1"))["sha"] == "c1"
+    assert clock.slept == [60.0]
+    assert client.requests == 2
+
+
+def test_retry_after_ignores_primary_reset(api):
+    # Con la ventana horaria ya conocida, Retry-After: 5 espera 5 s, no
+    # hasta X-RateLimit-Reset.
+    clock = FakeClock(1000.0)
+    api.reset = 4600
+    with GitHubClient("o/r", base_url=url(api), sleep=clock.sleep,
+                      clock=clock) as client:
+        client.get(client.commit_path("c1"))
+        api.limited = 1
+        api.retry_after = 5
+        assert client.get(client.commit_path("c2"))["sha"] == "c2"
+    assert clock.slept == [5.0]
+    assert client.requests == 3
+
+
+def test_retry_after_survives_in_flight_responses(api):
+    # Una respuesta en vuelo que trae una ventana horaria nueva no levanta
+    # el bloqueo de Retry-After.
+    clock = FakeClock(1000.0)
+    api.reset = 4600
+    with GitHubClient("o/r", base_url=url(api), sleep=clock.sleep,
+                      clock=clock) as client:
+        client._retry_after(5)
+        _, response, _ = client._request(client.commit_path("c1"), {})
+        client._update_rate_limit(response)
+        client._wait_for_rate_limit()
+    assert clock.slept == [5.0]
+
+
+def test_rate_limit_blocks_every_caller(api):
+    # Los dos hilos deben estar dormidos a la vez hasta el reinicio.
+    barrier = threading.Barrier(2, timeout=5)
+    clock = FakeClock(-10.0)
+
+    def sleep(delay):
+        barrier.wait()
+        clock.sleep(delay)
+
+    with GitHubClient("o/r", base_url=url(api), workers=2, sleep=sleep,
+                      clock=clock) as client:
+        client._remaining = 0
+        results = client.get_many(client.commit_path(s) for s in ("c2", "c3"))
+    assert [item["sha"] for item in results.values()] == ["c2", "c3"]
+    assert len(clock.slept) == 2
+
+
+def test_rate_limit_exhausted(api):
+    api.limited = 5
+    with GitHubClient("o/r", base_url=url(api), sleep=lambda _: None) as client:
+        with pytest.raises(ValueError, match="rate limit"):
+            client.get(client.commit_path("c1"))
+
+
+def test_invalid_api_url():
+    with pytest.raises(ValueError, match="Invalid API URL"):
+        GitHubClient("o/r", base_url="ftp://example.com")
+
+
+def test_cli_github(api, tmp_path, write_loose):
+    objects_dir = tmp_path / ".git" / "objects"
+    objects_dir.mkdir(parents=True)
+    write_loose(objects_dir, "commit", b"tree abc\n\nmsg")
+    output = tmp_path / "out.graphml"
+
+    result = CliRunner().invoke(cli, [
+        "github", str(tmp_path), "-r", "o/r", "--api-url", url(api),
+        "-o", str(output),
+    ])
+    assert result.exit_code == 0
+    assert "0/1 commits con metadatos remotos" in result.output
+    assert output.exists()
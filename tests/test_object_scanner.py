@@ -4,7 +4,8 @@ import struct
 import zlib
 
 import pytest
-from guardian.object_scanner import read_loose, read_packfile
+from guardian import object_scanner
+from guardian.object_scanner import iter_commits, read_loose, read_packfile
 
 
 @pytest.fixture
@@ -140,3 +141,60 @@ def test_read_packfile_valid(valid_packfile):
     assert len(objects) == 1
     assert objects[0].type == "blob"
     assert objects[0].data == b"blob 4\x00test"
+
+
+def test_read_packfile_with_trailer(valid_packfile):
+    """Prueba que se acepta un trailer SHA-1 correcto"""
+    data = valid_packfile.read_bytes()
+    valid_packfile.write_bytes(data + hashlib.sha1(data).digest())
+
+    assert len(read_packfile(valid_packfile)) == 1
+
+
+def test_read_packfile_bad_trailer(valid_packfile):
+    """Prueba detección de un trailer SHA-1 incorrecto"""
+    data = valid_packfile.read_bytes()
+    valid_packfile.write_bytes(data + b"\x00" * 20)
+
+    with pytest.raises(ValueError, match="Pack checksum mismatch"):
+        read_packfile(valid_packfile)
+
+
+def test_read_packfile_trailing_garbage(valid_packfile):
+    """Prueba detección de bytes sobrantes tras la última entrada"""
+    valid_packfile.write_bytes(valid_packfile.read_bytes() + b"junk")
+
+    with pytest.raises(ValueError, match="Unexpected 4 bytes"):
+        read_packfile(valid_packfile)
+
+
+def test_iter_commits_only_inflates_commits(tmp_path, write_loose, pack_entry, mocker):
+    """Prueba que solo se inflan las entradas de tipo commit"""
+    objects_dir = tmp_path / "objects"
+    pack_dir = objects_dir / "pack"
+    pack_dir.mkdir(parents=True)
+    body = b"tree abc\n\npacked"
+    entries = [pack_entry(3, b"x" * 1000), pack_entry(1, body), pack_entry(2, b"t")]
+    (pack_dir / "a.pack").write_bytes(
+        struct.pack(">4sII", b"PACK", 2, len(entries)) + b"".join(entries)
+    )
+    packed = read_packfile(pack_dir / "a.pack")[1]
+    spy = mocker.spy(object_scanner.zlib, "decompress")
+
+    commits = list(iter_commits(tmp_path))
+
+    # Mismo SHA y payload que read_packfile, que alimenta export-graph.
+    assert commits == [(packed.sha, packed.data)]
+    assert spy.call_count == 1
+
+
+def test_iter_commits_loose_and_corrupt(tmp_path, write_loose):
+    """Prueba objetos sueltos y que los packfiles corruptos se omiten"""
+    objects_dir = tmp_path / "objects"
+    write_loose(objects_dir, "blob", b"data")
+    sha = write_loose(objects_dir, "commit", b"tree abc\n\nloose")
+    pack_dir = objects_dir / "pack"
+    pack_dir.mkdir()
+    (pack_dir / "bad.pack").write_bytes(b"PACK" + b"\x00" * 20)
+
+    assert list(iter_commits(tmp_path)) == [(sha, b"tree abc\n\nloose")]
@@ -0,0 +1,102 @@
+import hashlib
+import struct
+import zlib
+
+import pytest
+from click.testing import CliRunner
+from guardian.cli import cli
+from guardian.pack_verify import verify_pack, verify_packs
+
+
+def write_pack(path, entries, trailer=True):
+    data = struct.pack(">4sII", b"PACK", 2, len(entries)) + b"".join(entries)
+    if trailer:
+        data += hashlib.sha1(data).digest()
+    path.write_bytes(data)
+    return path
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    pack_dir = tmp_path / ".git" / "objects" / "pack"
+    pack_dir.mkdir(parents=True)
+    return pack_dir
+
+
+@pytest.mark.parametrize("full", [False, True])
+def test_verify_pack_valid(pack_dir, pack_entry, full):
+    entries = [pack_entry(3, b"x" * 50_000), pack_entry(1, b"tree abc\n\nmsg")]
+    pack = write_pack(pack_dir / "a.pack", entries)
+
+    result = verify_pack(pack, full=full)
+
+    assert result.ok, result.error
+    assert result.objects == 2
+    assert result.has_trailer
+    assert result.size == pack.stat().st_size
+    assert result.throughput > 0
+
+
+def test_verify_pack_fast_does_not_inflate(pack_dir, pack_entry, mocker):
+    pack = write_pack(pack_dir / "a.pack", [pack_entry(3, b"data")])
+    inflate = mocker.spy(zlib, "decompress")
+
+    result = verify_pack(pack)
+
+    assert result.ok and result.has_trailer
+    assert inflate.call_count == 0
+
+
+@pytest.mark.parametrize("full", [False, True])
+def test_verify_pack_requires_trailer(pack_dir, pack_entry, full):
+    pack = write_pack(pack_dir / "a.pack", [pack_entry(3, b"data")], trailer=False)
+
+    result = verify_pack(pack, full=full)
+
+    assert result.error == "Missing pack checksum trailer"
+    assert result.objects == 1
+
+
+def test_verify_pack_fast_detects_corruption(pack_dir, pack_entry):
+    entry = bytearray(pack_entry(3, b"y" * 1000))
+    entry[10] ^= 0xFF
+    bad_crc = write_pack(pack_dir / "crc.pack", [bytes(entry)], trailer=False)
+    bad_sum = write_pack(pack_dir / "sum.pack", [pack_entry(3, b"z")])
+    data = bytearray(bad_sum.read_bytes())
+    data[-1] ^= 0xFF
+    bad_sum.write_bytes(data)
+
+    assert "CRC mismatch" in verify_pack(bad_crc).error
+    assert "checksum mismatch" in verify_pack(bad_sum).error
+    assert "checksum mismatch" in verify_pack(bad_sum, full=True).error
+
+
+def test_verify_packs_all(pack_dir, pack_entry):
+    write_pack(pack_dir / "a.pack", [pack_entry(3, b"a")])
+    write_pack(pack_dir / "b.pack", [pack_entry(3, b"b")])
+    (pack_dir / "c.pack").write_bytes(b"PACK")
+
+    results = verify_packs(pack_dir.parent.parent, jobs=2)
+
+    assert [r.path.name for r in results] == ["a.pack", "b.pack", "c.pack"]
+    assert [r.ok for r in results] == [True, True, False]
+
+
+def test_cli_verify_packs(pack_dir, pack_entry):
+    write_pack(pack_dir / "a.pack", [pack_entry(3, b"a")])
+    repo = pack_dir.parent.parent.parent
+
+    result = CliRunner().invoke(cli, ["verify-packs", str(repo)])
+    assert result.exit_code == 0
+    assert "✓ a.pack: 1 objetos" in result.output
+    assert "Verificación rápida: 1 packfiles" in result.output
+
+    write_pack(pack_dir / "b.pack", [pack_entry(3, b"b")], trailer=False)
+    result = CliRunner().invoke(cli, ["verify-packs", str(repo)])
+    assert result.exit_code == 2
+    assert "Missing pack checksum trailer" in result.output
+
+    (pack_dir / "b.pack").write_bytes(b"JUNK" + b"\x00" * 8)
+    result = CliRunner().invoke(cli, ["verify-packs", str(repo), "--full"])
+    assert result.exit_code == 2
+    assert "Invalid packfile signature" in result.output
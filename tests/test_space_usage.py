@@ -0,0 +1,69 @@
+import struct
+
+from click.testing import CliRunner
+from guardian import space_usage as su
+from guardian.cli import cli
+from guardian.space_usage import space_usage
+from guardian.utils import format_size
+
+
+def make_repo(tmp_path, write_loose, pack_entry):
+    objects_dir = tmp_path / ".git" / "objects"
+    objects_dir.mkdir(parents=True)
+    write_loose(objects_dir, "blob", b"x" * 5000)
+    write_loose(objects_dir, "commit", b"tree abc\n\nmsg")
+    pack_dir = objects_dir / "pack"
+    pack_dir.mkdir()
+    entries = [
+        pack_entry(3, b"y" * 100_000),
+        pack_entry(2, b"tree data"),
+        pack_entry(3, bytes(range(256)) * 4, header=False),
+    ]
+    (pack_dir / "p.pack").write_bytes(
+        struct.pack(">4sII", b"PACK", 2, len(entries)) + b"".join(entries)
+    )
+    return tmp_path
+
+
+def test_space_usage_totals_and_top(tmp_path, write_loose, pack_entry, mocker):
+    repo = make_repo(tmp_path, write_loose, pack_entry)
+    spy = mocker.spy(su, "_inflated_size")
+
+    report = space_usage(repo / ".git", top=2)
+
+    assert report.count == {"blob": 3, "commit": 1, "tree": 1}
+    assert report.uncompressed["blob"] == 5000 + 100_000 + 1024
+    assert report.uncompressed["tree"] == 9
+    assert [obj[0] for obj in report.top_objects()] == [100_000, 5000]
+    assert report.top_objects()[0][3] == "p.pack@12"
+    assert report.ratio > 1
+    assert report.errors == []
+    assert spy.call_count == 3
+
+
+def test_space_usage_reports_corrupt_pack(tmp_path):
+    pack_dir = tmp_path / "objects" / "pack"
+    pack_dir.mkdir(parents=True)
+    (pack_dir / "bad.pack").write_bytes(b"NOPE" + b"\x00" * 8)
+    (pack_dir / "empty.pack").touch()
+
+    report = space_usage(tmp_path)
+
+    assert sorted(msg for _, msg in report.errors) == [
+        "Invalid packfile signature",
+        "Packfile too small to be valid",
+    ]
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KiB"
+    assert format_size(3 * 1024 ** 3) == "3.0 GiB"
+
+
+def test_cli_du(tmp_path, write_loose, pack_entry):
+    repo = make_repo(tmp_path, write_loose, pack_entry)
+    result = CliRunner().invoke(cli, ["du", str(repo), "--top", "1"])
+    assert result.exit_code == 0
+    assert "97.7 KiB" in result.output
+    assert "p.pack@12" in result.output
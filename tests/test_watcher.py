@@ -0,0 +1,158 @@
+import hashlib
+import socket
+import threading
+
+import pytest
+from click.testing import CliRunner
+from guardian import watcher
+from guardian.cli import cli
+from guardian.watcher import ObjectIndex, WatchServer, query
+
+
+@pytest.fixture
+def git_dir(tmp_path):
+    git_dir = tmp_path / ".git"
+    (git_dir / "objects").mkdir(parents=True)
+    return git_dir
+
+
+def test_refresh_only_verifies_new_objects(git_dir, write_loose, mocker):
+    objects_dir = git_dir / "objects"
+    write_loose(objects_dir, "blob", b"one")
+    index = ObjectIndex(git_dir)
+    spy = mocker.spy(watcher, "read_loose")
+
+    assert len(index.refresh()) == 1
+    assert index.refresh() == []
+
+    write_loose(objects_dir, "blob", b"two")
+    assert len(index.refresh()) == 1
+    assert spy.call_count == 2
+
+
+def test_refresh_tracks_commits_and_errors(git_dir, write_loose):
+    objects_dir = git_dir / "objects"
+    parent = write_loose(objects_dir, "commit", b"tree abc\n\nfirst")
+    child = write_loose(objects_dir, "commit", f"parent {parent}\n\nsecond".encode())
+    bad = objects_dir / "ff" / "00"
+    bad.parent.mkdir()
+    bad.write_bytes(b"not zlib")
+
+    index = ObjectIndex(git_dir)
+    index.refresh()
+
+    assert set(index.commits) == {parent, child}
+    assert (parent, child) in index.dag.edges
+    assert list(index.errors) == [bad]
+
+    bad.unlink()
+    index.refresh()
+    assert index.errors == {}
+
+
+def test_refresh_survives_os_errors(git_dir, write_loose, mocker):
+    objects_dir = git_dir / "objects"
+    locked = write_loose(objects_dir, "blob", b"locked")
+    index = ObjectIndex(git_dir)
+    mocker.patch.object(watcher, "read_loose", side_effect=PermissionError("denied"))
+    index.refresh()
+    assert index.errors == {objects_dir / locked[:2] / locked[2:]: "denied"}
+
+    write_loose(objects_dir, "blob", b"gone")
+    watcher.read_loose.side_effect = FileNotFoundError
+    index.refresh()
+    assert len(index.seen) == 1
+
+
+def test_server_answers_queries(git_dir, tmp_path, write_loose):
+    write_loose(git_dir / "objects", "commit", b"tree abc\n\nmsg")
+    socket_path = tmp_path / "g.sock"
+    server = WatchServer(socket_path, ObjectIndex(git_dir))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        scan = query(socket_path, "scan")
+        assert scan == {"ok": True, "objects": 1, "errors": {}}
+
+        output = tmp_path / "dag.graphml"
+        export = query(socket_path, f"export {output}")
+        assert export["ok"] and export["commits"] == 1
+        assert output.exists()
+
+        assert query(socket_path, "bogus")["ok"] is False
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cli_query_reports_errors(git_dir, mocker):
+    mocker.patch(
+        "guardian.cli.query",
+        return_value={"ok": True, "objects": 2, "errors": {"ab/cd": "bad"}},
+    )
+    result = CliRunner().invoke(cli, ["query", str(git_dir.parent), "scan"])
+    assert result.exit_code == 2
+    assert "Se encontraron 1 errores" in result.output
+
+
+def test_cli_query_without_daemon(git_dir):
+    result = CliRunner().invoke(cli, ["query", str(git_dir.parent), "scan"])
+    assert result.exit_code == 1
+    assert "Error" in result.output
+
+
+def test_watch_serves_until_stopped(git_dir, tmp_path, write_loose):
+    socket_path = tmp_path / "w.sock"
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watcher.watch, args=(git_dir, socket_path, 0.01, stop)
+    )
+    thread.start()
+    try:
+        for _ in range(200):
+            if socket_path.exists():
+                break
+            stop.wait(0.01)
+        write_loose(git_dir / "objects", "blob", b"late")
+        assert query(socket_path, "scan")["objects"] == 1
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    assert not socket_path.exists()
+
+
+def test_refresh_child_before_parent(git_dir, write_loose):
+    objects_dir = git_dir / "objects"
+    parent_data = b"tree abc\n\nfirst"
+    parent = hashlib.sha1(
+        f"commit {len(parent_data)}\0".encode() + parent_data
+    ).hexdigest()
+    child = write_loose(objects_dir, "commit", f"parent {parent}\n\nsecond".encode())
+    index = ObjectIndex(git_dir)
+    index.refresh()
+    assert list(index.dag.edges) == []
+
+    write_loose(objects_dir, "commit", parent_data)
+    index.refresh()
+    assert list(index.dag.edges) == [(parent, child)]
+
+
+def test_server_refuses_live_socket(git_dir, tmp_path):
+    socket_path = tmp_path / "g.sock"
+    server = WatchServer(socket_path, ObjectIndex(git_dir))
+    try:
+        with pytest.raises(ValueError, match="already listening"):
+            WatchServer(socket_path, ObjectIndex(git_dir))
+        assert socket_path.exists()
+    finally:
+        server.server_close()
+
+
+def test_server_replaces_stale_socket(git_dir, tmp_path):
+    socket_path = tmp_path / "g.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()
+
+    server = WatchServer(socket_path, ObjectIndex(git_dir))
+    server.server_close()